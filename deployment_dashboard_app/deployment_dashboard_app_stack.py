@@ -19,6 +19,13 @@ class DeploymentDashboardAppStack(Stack):
 
         # Definiuję potrzebne zmienne
         s3_bucket_name = "panel-wdrozen-bucket"
+        # Klucze tagów repozytoriów, z których wartości tworzone są zespoły,
+        # pusta wartość wyłącza grupowanie po tagach
+        relevant_tag_names = self.node.try_get_context("relevant_tag_names")
+        if relevant_tag_names is None:
+            relevant_tag_names = "test1,testtag,test_tag1"
+        if isinstance(relevant_tag_names, list):
+            relevant_tag_names = ",".join(relevant_tag_names)
 
         # Tworzę publiczny S3 Bucket, w którym bedę przechowywać dane oraz stworzę strone z panelem wdrożeń
         dashboard_bucket = s3.Bucket(
@@ -112,6 +119,7 @@ class DeploymentDashboardAppStack(Stack):
             iam.PolicyStatement(
                 effect=iam.Effect.ALLOW,
                 actions=[
+                    "s3:GetObject",
                     "s3:PutObject",
                     "s3:PutObjectAcl",
                 ],
@@ -154,6 +162,28 @@ class DeploymentDashboardAppStack(Stack):
             )
         )
 
+        # Tworze role oraz dla Lambdy, która łączy dane i dzieli je na zespoły
+        self._publish_dashboard_data = iam.Role(
+            self,
+            f"publish-dashboard-data-role",
+            role_name=f"publish-dashboard-data-role",
+            assumed_by=iam.ServicePrincipal("lambda.amazonaws.com"),
+        )
+
+        self._publish_dashboard_data.add_to_policy(
+            iam.PolicyStatement(
+                effect=iam.Effect.ALLOW,
+                actions=[
+                    "s3:GetObject",
+                    "s3:PutObject",
+                    "s3:PutObjectAcl",
+                    "s3:DeleteObject",
+                    "s3:ListBucket",
+                ],
+                resources=[f"{dashboard_bucket.bucket_arn}*"],
+            )
+        )
+
         # Tworzę lambdę do otrzymywania informacji na temat CodeCommit
         self.get_codecommit = aws_lambda.Function(
             self,
@@ -163,6 +193,7 @@ class DeploymentDashboardAppStack(Stack):
             runtime=aws_lambda.Runtime.PYTHON_3_9,
             timeout=Duration.minutes(15),
             role=self._fetch_codecommit_data,
+            environment={"RELEVANT_TAG_NAMES": relevant_tag_names},
         )
 
         # Tworzę lambdę do otrzymywania informacji na temat CodePipeline
@@ -187,6 +218,17 @@ class DeploymentDashboardAppStack(Stack):
             role=self._fetch_codebuild_data,
         )
 
+        # Tworzę lambdę do publikowania danych podzielonych na zespoły
+        self.publish_dashboard_data = aws_lambda.Function(
+            self,
+            id="PublishDashboardData",
+            code=aws_lambda.Code.from_asset("./src/"),
+            handler="publish_dashboard_data_lambda.lambda_handler",
+            runtime=aws_lambda.Runtime.PYTHON_3_9,
+            timeout=Duration.minutes(5),
+            role=self._publish_dashboard_data,
+        )
+
         self.rule = aws_events.Rule(
             self,
             "Run every 15 minutes",
@@ -197,3 +239,15 @@ class DeploymentDashboardAppStack(Stack):
         self.rule.add_target(aws_events_targets.LambdaFunction(self.get_codecommit))
         self.rule.add_target(aws_events_targets.LambdaFunction(self.get_codepipeline))
         self.rule.add_target(aws_events_targets.LambdaFunction(self.get_codebuild))
+
+        # Publikacja uruchamia się po zakończeniu zbierania danych
+        self.publish_rule = aws_events.Rule(
+            self,
+            "Publish team data",
+            schedule=aws_events.Schedule.cron(
+                minute="45", hour="*", week_day="*", month="*", year="*"
+            ),
+        )
+        self.publish_rule.add_target(
+            aws_events_targets.LambdaFunction(self.publish_dashboard_data)
+        )
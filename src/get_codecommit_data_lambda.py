@@ -2,6 +2,7 @@
     a następnie przesyła wygenerowany plik json do S3 bucket"""
 import boto3
 import logging
+import os
 from botocore.config import Config
 from botocore.exceptions import ClientError
 from concurrent.futures import ThreadPoolExecutor
@@ -15,6 +16,7 @@ BUCKET_NAME = "panel-wdrozen-bucket"
 DEFAULT_BRANCH_NAME = "master"
 DEV_BRANCH_NAME = "dev"
 PROD_BRANCH_NAME = "prod"
+RELEVANT_TAG_NAMES = os.environ.get("RELEVANT_TAG_NAMES", "")
 
 CLIENT_CONFIG = Config(retries={"max_attempts": 5, "mode": "adaptive"})
 
@@ -109,13 +111,14 @@ def get_pull_requests(client, repository_name) -> list:
 def get_repository_tags(client, repository_name) -> list:
     """Pobiera tagi repozytorium dla określonego repozytorium"""
     try:
-        relevant_tag_names = "test1,testtag,test_tag1"
-        if relevant_tag_names:
+        if RELEVANT_TAG_NAMES:
             response = client.get_repository(repositoryName=repository_name)
             repository_arn = response.get("repositoryMetadata")["Arn"]
             tags = client.list_tags_for_resource(resourceArn=repository_arn)
             result = tags.get("tags")
-            tags_list = get_relevant_tags(relevant_tag_names.split(","), result)
+            tags_list = get_relevant_tags(
+                [name.strip() for name in RELEVANT_TAG_NAMES.split(",")], result
+            )
             return tags_list
     except ClientError as err:
         print(err)
@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 """Moduł zawiera funkcje Lambda do pobierania informacji na temat CodePipeline, 
     a następnie przesyła wygenerowany plik json do S3 bucket"""
+import copy
 import logging
 from concurrent.futures import ThreadPoolExecutor
 
@@ -8,40 +9,179 @@ import boto3
 from botocore.client import Config
 from botocore.exceptions import ClientError
 
-from helper import dump_to_s3
+from helper import dump_to_s3, load_from_s3
 
 log = logging.getLogger()
 
 THREAD_WORKERS = 60
 BUCKET_NAME = "panel-wdrozen-bucket"
+STATE_FILE_NAME = "data/codepipeline-state.json"
 CLIENT_CONFIG = Config(retries={"max_attempts": 5, "mode": "adaptive"})
 
-
-def get_pipeline_exec(client, pipeline_name) -> str:
-    """Zwraca status dla ostatnio wykonanego Pipeline"""
-    try:
-        response = client.list_pipeline_executions(
-            pipelineName=pipeline_name, maxResults=1
-        )
-    except ClientError as err:
-        if err.response["Error"]["Code"] == "PipelineNotFoundException":
-            return "No Pipeline"
-        return "Error"
-    # Extract the most recent execution from the response
-    if response.get("pipelineExecutionSummaries"):
-        last_execution = response["pipelineExecutionSummaries"][0]["status"]
-        return last_execution
-    return "N/A"
+# Liczba ostatnich zakończonych wykonań, z których liczone są statystyki
+ROLLING_WINDOW = 20
+# Rozmiar strony przy pobieraniu wykonań nowszych niż znacznik
+PAGE_SIZE = 5
+TERMINAL_STATUSES = ("Succeeded", "Failed", "Stopped", "Superseded", "Cancelled")
+# Wykonania, które nie zostały uruchomione, nie wchodzą do statystyk
+SKIPPED_STATUSES = ("Superseded", "Cancelled")
+
+
+def new_pipeline_state() -> dict:
+    """Zwraca pusty stan dla Pipeline, który nie był jeszcze przetwarzany"""
+    return {
+        "last_execution_id": None,
+        "last_status": "N/A",
+        "pending": [],
+        "window": [],
+        "succeeded": 0,
+        "failures": 0,
+        "duration_sum": 0,
+        "stages": {},
+    }
+
+
+def get_new_executions(client, pipeline_name, state) -> list:
+    """Zwraca wykonania nowsze niż znacznik oraz te, które wcześniej były w toku"""
+    last_execution_id = state["last_execution_id"]
+    pending = set(state["pending"])
+    kwargs = {
+        "pipelineName": pipeline_name,
+        "maxResults": PAGE_SIZE if last_execution_id else ROLLING_WINDOW,
+    }
+    executions = []
+    # Bez znacznika pobieramy całe okno, aby zainicjować statystyki
+    seen_last = False
+    while True:
+        response = client.list_pipeline_executions(**kwargs)
+        for summary in response.get("pipelineExecutionSummaries", []):
+            execution_id = summary["pipelineExecutionId"]
+            if execution_id == last_execution_id:
+                seen_last = True
+            pending.discard(execution_id)
+            executions.append(summary)
+            if (seen_last and not pending) or len(executions) >= ROLLING_WINDOW:
+                return executions
+        if not response.get("nextToken"):
+            return executions
+        kwargs["nextToken"] = response["nextToken"]
+
+
+def add_to_window(state, execution):
+    """Dodaje zakończone wykonanie do okna statystyk, aktualizując sumy przyrostowo"""
+    status = execution["status"]
+    if status in SKIPPED_STATUSES:
+        return
+    duration = (execution["lastUpdateTime"] - execution["startTime"]).total_seconds()
+    entry = {
+        "id": execution["pipelineExecutionId"],
+        "status": status,
+        "duration": round(duration),
+    }
+    state["window"].append(entry)
+    update_sums(state, entry, 1)
+    if len(state["window"]) > ROLLING_WINDOW:
+        update_sums(state, state["window"].pop(0), -1)
+
+
+def update_sums(state, entry, sign):
+    """Dodaje lub odejmuje wpis okna od sum używanych do statystyk"""
+    if entry["status"] == "Succeeded":
+        state["succeeded"] += sign
+        state["duration_sum"] += sign * entry["duration"]
+    elif entry["status"] == "Failed":
+        state["failures"] += sign
+
+
+def get_stage_states(client, pipeline_name) -> dict:
+    """Zwraca status ostatniego wykonania dla każdego etapu Pipeline"""
+    response = client.get_pipeline_state(name=pipeline_name)
+    return {
+        stage["stageName"]: stage.get("latestExecution", {}).get("status", "N/A")
+        for stage in response.get("stageStates", [])
+    }
+
+
+def get_pipeline_exec(client, pipeline_name, state) -> dict:
+    """Aktualizuje stan Pipeline o wykonania, które pojawiły się od ostatniego uruchomienia"""
+    known_ids = {entry["id"] for entry in state["window"]}
+    executions = get_new_executions(client, pipeline_name, state)
+    if not executions:
+        return state
+
+    fetched_ids = {execution["pipelineExecutionId"] for execution in executions}
+    previous_last_id = state["last_execution_id"]
+    previous_pending = set(state["pending"]) & fetched_ids
+    # Wykonania w toku, których nie znaleziono w oknie, są porzucane
+    for execution_id in set(state["pending"]) - fetched_ids:
+        log.info("Dropping pending execution: %s", execution_id)
+    # Gdy znacznika nie ma na liście (dużo nowych wykonań), wszystkie są nowe
+    seen_last = previous_last_id not in fetched_ids
+    pending = []
+    changed = False
+    # Wykonania są zwracane od najnowszego, statystyki liczymy od najstarszego
+    for execution in reversed(executions):
+        execution_id = execution["pipelineExecutionId"]
+        is_new = seen_last and execution_id != previous_last_id
+        if execution_id == previous_last_id:
+            seen_last = True
+        if not (is_new or execution_id in previous_pending):
+            continue
+        if execution["status"] not in TERMINAL_STATUSES:
+            pending.append(execution_id)
+        elif execution_id not in known_ids:
+            add_to_window(state, execution)
+        if is_new or execution["status"] in TERMINAL_STATUSES:
+            changed = True
+
+    newest = executions[0]
+    state["last_execution_id"] = newest["pipelineExecutionId"]
+    state["last_status"] = newest["status"]
+    state["pending"] = pending
+    # Stan etapów pobieramy tylko wtedy, gdy coś się zmieniło lub nadal trwa
+    if changed or pending or not state["stages"]:
+        state["stages"] = get_stage_states(client, pipeline_name)
+    return state
+
+
+def get_pipeline_stats(state) -> dict:
+    """Zwraca statystyki czasu trwania i odsetka błędów wyliczone z okna wykonań"""
+    window_size = len(state["window"])
+    failed_stage = next(
+        (name for name, status in state["stages"].items() if status == "Failed"),
+        None,
+    )
+    return {
+        "stages": state["stages"],
+        "failed_stage": failed_stage,
+        "executions": window_size,
+        "failure_rate": round(state["failures"] / window_size, 2)
+        if window_size
+        else None,
+        "avg_duration": round(state["duration_sum"] / state["succeeded"])
+        if state["succeeded"]
+        else None,
+    }
 
 
 def get_all_pipeline_info(args):
     """Tworzy raport dla każdego Pipeline"""
-    pipeline_name, codepipeline_client = args
+    pipeline_name, codepipeline_client, state = args
     log.info("Processing Pipeline: %s", pipeline_name)
-    report_item = [
-        get_pipeline_exec(client=codepipeline_client, pipeline_name=pipeline_name),
-    ]
-    return report_item
+    try:
+        # Pracujemy na kopii, aby przy błędzie zapisać poprzedni stan i ponowić zmiany
+        new_state = get_pipeline_exec(
+            client=codepipeline_client,
+            pipeline_name=pipeline_name,
+            state=copy.deepcopy(state),
+        )
+    except ClientError as err:
+        if err.response["Error"]["Code"] == "PipelineNotFoundException":
+            return ["No Pipeline", None], state
+        log.error(err)
+        return ["Error", None], state
+    report_item = [new_state["last_status"], get_pipeline_stats(new_state)]
+    return report_item, new_state
 
 
 def lambda_handler(event, context):
@@ -59,19 +199,27 @@ def lambda_handler(event, context):
         "codepipeline", config=Config(max_pool_connections=THREAD_WORKERS)
     )
 
+    pipeline_states = load_from_s3(
+        bucket_name=BUCKET_NAME, file_name=STATE_FILE_NAME, default={}
+    )
     pipelines = codepipeline_client.list_pipelines()
     pipeline = [
         (
             pipeline["name"],
             codepipeline_client,
+            pipeline_states.get(pipeline["name"]) or new_pipeline_state(),
         )
         for pipeline in pipelines.get("pipelines")
         # if repo["repositoryName"] in REPO_LIST
     ]
     with ThreadPoolExecutor(max_workers=THREAD_WORKERS) as executor:
         results = list(executor.map(get_all_pipeline_info, pipeline))
-    report = dict(zip([p[0].replace("-pipeline", "") for p in pipeline], results))
+    report = dict(
+        zip([p[0].replace("-pipeline", "") for p in pipeline], [r[0] for r in results])
+    )
+    pipeline_states = dict(zip([p[0] for p in pipeline], [r[1] for r in results]))
 
     dump_to_s3(report, bucket_name=BUCKET_NAME, file_name="data/codepipeline-data.json")
+    dump_to_s3(pipeline_states, bucket_name=BUCKET_NAME, file_name=STATE_FILE_NAME)
 
     return {"statusCode": 200, "body": "Lambda execution complete."}
@@ -18,6 +18,38 @@ def dump_to_s3(data, bucket_name, file_name):
         return False  # Failed to upload
 
 
+def load_from_s3(bucket_name, file_name, default=None):
+    """Wczytuje plik json z S3 bucket, zwraca default gdy plik nie istnieje"""
+    try:
+        s3 = boto3.client("s3")
+        response = s3.get_object(Bucket=bucket_name, Key=file_name)
+        return json.loads(response["Body"].read())
+    except Exception as e:
+        print(f"Error downloading from S3: {e}")
+        return default
+
+
+def list_s3_keys(bucket_name, prefix):
+    """Zwraca klucze obiektów w S3 bucket zaczynające się od prefix"""
+    try:
+        s3 = boto3.client("s3")
+        objects = paginator(s3.list_objects_v2, Bucket=bucket_name, Prefix=prefix)
+        return [obj["Key"] for obj in objects if "Key" in obj]
+    except Exception as e:
+        print(f"Error listing S3 objects: {e}")
+        return []
+
+
+def delete_from_s3(bucket_name, file_name):
+    try:
+        s3 = boto3.client("s3")
+        s3.delete_object(Bucket=bucket_name, Key=file_name)
+        return True  # Successfully deleted
+    except Exception as e:
+        print(f"Error deleting from S3: {e}")
+        return False  # Failed to delete
+
+
 def paginator(method, **kwargs):
     """
     Paginator używany z niektórymi wywołaniami boto3,
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""Moduł zawiera funkcję Lambda, która łączy dane z CodeCommit, CodeBuild i CodePipeline,
+    a następnie zapisuje osobny plik json dla każdego zespołu do S3 bucket"""
+import logging
+from collections import defaultdict
+
+from helper import delete_from_s3, dump_to_s3, list_s3_keys, load_from_s3
+
+log = logging.getLogger()
+
+BUCKET_NAME = "panel-wdrozen-bucket"
+DATA_FOLDER_PATH = "data"
+TEAMS_FOLDER_PATH = f"{DATA_FOLDER_PATH}/teams"
+# Indeks leży poza folderem zespołów, aby nie kolidował z tagiem "index"
+TEAMS_INDEX_FILE = f"{DATA_FOLDER_PATH}/teams-index.json"
+
+# Pliki w kolejności kolumn panelu, razem z liczbą kolumn uzupełnianych przy braku danych
+DATA_FILES = [
+    ("codebuild-cov-data.dev.json", 2),
+    ("codebuild-unit-data.dev.json", 1),
+    # Wiersz CodePipeline to [status, statystyki], patrz get_all_pipeline_info
+    ("codepipeline-data.json", 2),
+]
+CODECOMMIT_FILE = "codecommit-data.json"
+TAGS_COLUMN = 1
+
+
+def join_dashboard_data(repositories: dict, data_files: list) -> dict:
+    """Łączy dane w wiersze panelu tak samo jak robi to index.js"""
+    dashboard_data = {key: list(row) for key, row in repositories.items()}
+    for data, empty_columns in data_files:
+        for project_key, row in dashboard_data.items():
+            row.extend(data.get(project_key) or [None] * empty_columns)
+    return dashboard_data
+
+
+def build_tag_index(dashboard_data: dict) -> dict:
+    """Tworzy indeks odwrotny: wartość tagu -> lista kluczy projektów"""
+    index = defaultdict(list)
+    for project_key, row in dashboard_data.items():
+        for tag in row[TAGS_COLUMN] or []:
+            index[tag].append(project_key)
+    return {tag: sorted(project_keys) for tag, project_keys in sorted(index.items())}
+
+
+def lambda_handler(event, context):
+    """Zapisuje indeks zespołów oraz wiersze panelu podzielone per zespół"""
+
+    log.debug(context)
+    log.info(event)
+
+    repositories = load_from_s3(
+        bucket_name=BUCKET_NAME,
+        file_name=f"{DATA_FOLDER_PATH}/{CODECOMMIT_FILE}",
+    )
+    # Bez danych CodeCommit nie wiadomo, które zespoły istnieją, więc nic nie zmieniamy
+    if repositories is None:
+        log.error("Could not load %s, skipping publish", CODECOMMIT_FILE)
+        return {"statusCode": 500, "body": "CodeCommit data not available."}
+    data_files = [
+        (
+            load_from_s3(
+                bucket_name=BUCKET_NAME,
+                file_name=f"{DATA_FOLDER_PATH}/{file_name}",
+                default={},
+            ),
+            empty_columns,
+        )
+        for file_name, empty_columns in DATA_FILES
+    ]
+    dashboard_data = join_dashboard_data(repositories, data_files)
+    tag_index = build_tag_index(dashboard_data)
+
+    shard_files = set()
+    for tag, project_keys in tag_index.items():
+        log.info("Publishing team: %s (%s projects)", tag, len(project_keys))
+        shard_file = f"{TEAMS_FOLDER_PATH}/{tag}.json"
+        shard_files.add(shard_file)
+        dump_to_s3(
+            [dashboard_data[project_key] for project_key in project_keys],
+            bucket_name=BUCKET_NAME,
+            file_name=shard_file,
+        )
+    if not dump_to_s3(tag_index, bucket_name=BUCKET_NAME, file_name=TEAMS_INDEX_FILE):
+        log.error("Could not write %s, keeping existing team files", TEAMS_INDEX_FILE)
+        return {"statusCode": 500, "body": "Team index not written."}
+
+    # Usuwam pliki zespołów, których tag zniknął lub nie ma już projektów
+    for stale_file in set(
+        list_s3_keys(bucket_name=BUCKET_NAME, prefix=f"{TEAMS_FOLDER_PATH}/")
+    ) - shard_files:
+        log.info("Removing stale team file: %s", stale_file)
+        delete_from_s3(bucket_name=BUCKET_NAME, file_name=stale_file)
+
+    return {"statusCode": 200, "body": "Lambda execution complete."}
@@ -8,6 +8,7 @@ const DATA_FILE_NAMES = [
   'data/codebuild-unit-data.dev.json',
   'data/codepipeline-data.json',
 ];
+const TEAMS_FOLDER = 'data/teams';
 
 const COLOR_MAP = {
   Succeeded: 'text-green-600',
@@ -190,31 +191,53 @@ function reloadPage() {
 let grid = null;
 // const height = getWindowHeight();
 
+function fetchJSON(file) {
+  return fetch(file)
+    .then((response) => {
+      if (!response.ok) {
+        console.error('HTTP error ' + response.status);
+        return [];
+      }
+      return response.json().catch((error) => {
+        console.error('Parsing error for file: ' + file, error);
+        return [];
+      });
+    })
+    .catch(function () {
+      console.error("This file can't be loaded: " + file);
+      return [];
+    });
+}
+function setConsoleUrls() {
+  BASE_REGION = dashboardMeta.consoleDomain.split('.')[0];
+  BASE_CODECOMMIT_URL = `https://${dashboardMeta.consoleDomain}/codesuite/codecommit/repositories/`;
+  BASE_CODEPIPELINE_URL = `https://${dashboardMeta.consoleDomain}/codesuite/codepipeline/pipelines/`;
+}
+// Team view loads only the shard published for that team, e.g. ?team=payments
+function initTeamDashboard(team) {
+  Promise.all([
+    fetchJSON(DATA_FILE_NAMES[0]),
+    fetchJSON(`${TEAMS_FOLDER}/${encodeURIComponent(team)}.json`)
+  ]).then(([meta, teamRows]) => {
+    dashboardMeta = meta;
+    setConsoleUrls();
+    renderDashboard(teamRows);
+  });
+}
 function initDashboard() {
+  const team = new URLSearchParams(window.location.search).get('team');
+  if (team) {
+    initTeamDashboard(team);
+    return;
+  }
   Promise.all(
     DATA_FILE_NAMES.map((file) =>
-      fetch(file)
-        .then((response) => {
-          if (!response.ok) {
-            console.error('HTTP error ' + response.status);
-            return [];
-          }
-          return response.json().catch((error) => {
-            console.error('Parsing error for file: ' + file, error);
-            return [];
-          });
-        })
-        .catch(function () {
-          console.error("This file can't be loaded: " + file);
-          return [];
-        })
+      fetchJSON(file)
     )
   )
     .then((loadedDataJSON) => {
       dashboardMeta = loadedDataJSON.shift();
-      BASE_REGION = dashboardMeta.consoleDomain.split('.')[0];
-      BASE_CODECOMMIT_URL = `https://${dashboardMeta.consoleDomain}/codesuite/codecommit/repositories/`;
-      BASE_CODEPIPELINE_URL = `https://${dashboardMeta.consoleDomain}/codesuite/codepipeline/pipelines/`;
+      setConsoleUrls();
 
       const platformRepositories = loadedDataJSON.shift();
       const dashboardData = Object.assign(
@@ -248,20 +271,19 @@ function initDashboard() {
         }
       });
 
-      // Merge the Rest into Master Data
-      loadedDataJSON.forEach((obj) => {
-        // for each Object in the Master Data
-        // For each Object in the current data file
-        Object.keys(dashboardData).forEach((projectKey) => {
-          if (obj[projectKey]) {
-            dashboardData[projectKey] = [
-              ...dashboardData[projectKey],
-              ...obj[projectKey]
-            ];
-          } else {
-            dashboardData[projectKey] = [...dashboardData[projectKey], null];
-          }
-        });
+      const pipelineData = loadedDataJSON.shift();
+
+      // Merge PipelineData into Master Data, rows are [status, stats]
+      // Keep in sync with DATA_FILES in publish_dashboard_data_lambda.py
+      Object.keys(dashboardData).forEach((projectKey) => {
+        if (pipelineData[projectKey]) {
+          dashboardData[projectKey] = [
+            ...dashboardData[projectKey],
+            ...pipelineData[projectKey]
+          ];
+        } else {
+          dashboardData[projectKey] = [...dashboardData[projectKey], null, null];
+        }
       });
       renderDashboard(Object.values(dashboardData));
     }
@@ -724,6 +746,34 @@ function renderDashboard(dashboardData) {
                 return pipelineStatusLink(pipelineName, cell);
               }
             }
+          },
+          {
+            id: 'pipeline_history',
+            name: 'History',
+            sort: false,
+            formatter: (cell) => {
+              if (!cell) {
+                return notAvailable;
+              }
+              const failureRate =
+                cell.failure_rate === null ? 'N/A' : `${Math.round(cell.failure_rate * 100)}%`;
+              const avgDuration =
+                cell.avg_duration === null ? 'N/A' : `${Math.round(cell.avg_duration / 60)} min`;
+              return gridjs.h('div', { className: 'mx-1 font-bold text-slate-500' }, [
+                gridjs.h(
+                  'span',
+                  { className: 'block', title: `Last ${cell.executions} executions` },
+                  `${avgDuration} / ${failureRate} failed`
+                ),
+                cell.failed_stage
+                  ? gridjs.h(
+                    'span',
+                    { className: `block ${COLOR_MAP.Failed}` },
+                    `Failed: ${cell.failed_stage}`
+                  )
+                  : null
+              ]);
+            }
           }
         ]
       }